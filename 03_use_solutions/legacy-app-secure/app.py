@@ -3,29 +3,119 @@ Secure Flask Application - Best Practices Implementation
 Demonstrates proper security practices following CLAUDE.md rules
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
+from flask.json.provider import DefaultJSONProvider
+import orjson
 import sqlite3
+import base64
+import hashlib
 import os
+import re
 import logging
+import logging.handlers
+import queue
+import atexit
 from dotenv import load_dotenv
 from functools import wraps
 import secrets
+import threading
 from typing import Optional, Dict, Any, Tuple
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from cachetools import TTLCache
+from utils import rehash_if_needed, verify_password_or_dummy
 
 # Load environment variables from .env file
 load_dotenv()
 
 # Configure structured logging (LOGGING rule)
-logging.basicConfig(
-    level=os.getenv('LOG_LEVEL', 'INFO'),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s - %(pathname)s:%(lineno)d'
+# Request threads only enqueue records; a listener thread formats and writes
+# them, so stream I/O stays off the request path.
+_log_queue: queue.Queue = queue.Queue(-1)
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s - %(pathname)s:%(lineno)d'
+))
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, _log_stream_handler, respect_handler_level=True
 )
+
+_log_queue_handler = logging.handlers.QueueHandler(_log_queue)
+
+_root_logger = logging.getLogger()
+_root_logger.setLevel(os.getenv('LOG_LEVEL', 'INFO'))
+_root_logger.addHandler(_log_queue_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)  # Flushes queued records on shutdown
+
 logger = logging.getLogger(__name__)
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+
+    Serializes jsonify() responses and parses request bodies in C. Keeps
+    Flask's sorted keys, indentation in debug and non-string key coercion;
+    datetimes/Decimals/etc. still go through DefaultJSONProvider.default.
+
+    Differences from Flask's default provider:
+    - Output is UTF-8; ensure_ascii is ignored, so non-ASCII characters are
+      not \\u-escaped (the parsed JSON is identical).
+    - Objects orjson cannot encode, such as integers beyond 64 bits, fall
+      back to DefaultJSONProvider.dumps.
+    - loads() parses integers beyond 64 bits as floats, losing precision.
+      Request handlers must not rely on such values.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(
+                obj, default=kwargs.get('default', self.default), option=option
+            ).decode()
+        except orjson.JSONEncodeError:
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+# Fixed JSON response bodies, encoded once. Only the bytes are shared: a new
+# Response is built per request because Flask hooks may mutate its headers.
+_HEALTHY_BODY = app.json.dumps({"status": "healthy", "database": "connected"}).encode() + b"\n"
+_error_bodies: Dict[str, bytes] = {}
+
+
+def _json_response(body: bytes) -> Response:
+    """Wrap precomputed JSON bytes in a fresh Response."""
+    return app.response_class(body, mimetype=app.json.mimetype)
+
+
+def _error_response(message: str) -> Response:
+    """
+    Build an {"error": message} response, encoding each message only once.
+
+    Args:
+        message (str): Constant error message (never user input - bodies are
+            memoized per message)
+
+    Returns:
+        Response: JSON response; callers pair it with a status code
+    """
+    body = _error_bodies.get(message)
+    if body is None:
+        body = _error_bodies[message] = app.json.dumps({"error": message}).encode() + b"\n"
+    return _json_response(body)
+
 
 # SECURITY: Load configuration from environment variables (NO_SECRETS_IN_CODE, CONFIG_MANAGEMENT)
 API_KEY = os.getenv('API_KEY')
@@ -46,10 +136,126 @@ app.config['SESSION_COOKIE_SECURE'] = os.getenv('SESSION_COOKIE_SECURE', 'True')
 app.config['SESSION_COOKIE_HTTPONLY'] = os.getenv('SESSION_COOKIE_HTTPONLY', 'True') == 'True'
 app.config['SESSION_COOKIE_SAMESITE'] = os.getenv('SESSION_COOKIE_SAMESITE', 'Lax')
 
+# Shared HTTP session for the email service: pooled keep-alive connections
+# avoid a new TCP + TLS handshake on every send. Retries transient failures.
+_email_retry_strategy = Retry(
+    total=3,
+    backoff_factor=1,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=["POST"]
+)
+_email_session = requests.Session()
+_email_session.mount(
+    "https://",
+    HTTPAdapter(max_retries=_email_retry_strategy, pool_connections=10, pool_maxsize=100)
+)
+
+
+# Input validation patterns, compiled once at import
+_SEARCH_RE = re.compile(r'^[a-zA-Z0-9\s\-_.@]+$')  # Alphanumeric and common characters
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# One SQLite connection per worker thread, reused across requests
+_conn_local = threading.local()
+
+# Applied once to each new connection
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",     # Readers do not block the writer
+    "PRAGMA synchronous=NORMAL",   # Safe with WAL, avoids an fsync per commit
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",    # ~20 MB page cache, kept warm across requests
+    "PRAGMA foreign_keys=ON",      # delete_user cascades to the user's sessions
+)
+
+# Full-text index for /search. The trigram tokenizer matches arbitrary
+# substrings (same results as LIKE '%term%', case-insensitive) via an index
+# instead of a full table scan. Triggers keep it in sync with users.
+_SEARCH_INDEX_SCHEMA = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5(
+        username, email, content='users', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_fts_ai AFTER INSERT ON users BEGIN
+        INSERT INTO users_fts(rowid, username, email) VALUES (new.id, new.username, new.email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_fts_ad AFTER DELETE ON users BEGIN
+        INSERT INTO users_fts(users_fts, rowid, username, email)
+        VALUES ('delete', old.id, old.username, old.email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_fts_au AFTER UPDATE OF username, email ON users BEGIN
+        INSERT INTO users_fts(users_fts, rowid, username, email)
+        VALUES ('delete', old.id, old.username, old.email);
+        INSERT INTO users_fts(rowid, username, email) VALUES (new.id, new.username, new.email);
+    END
+    """,
+)
+
+# Endpoint SQL. Kept as constants so each statement's text is identical on
+# every request and hits sqlite3's per-connection prepared-statement cache
+# instead of going back through SQLite's parser.
+_SQL_GET_USER = "SELECT id, username, email FROM users WHERE id = ?"
+
+_SQL_LOGIN = "SELECT id, username, password_hash FROM users WHERE username = ?"
+
+# Only replaces the hash login verified, never a password changed meanwhile
+_SQL_REHASH = "UPDATE users SET password_hash = ? WHERE id = ? AND password_hash = ?"
+
+_SQL_SEARCH_FTS = """
+    SELECT u.id, u.username, u.email
+    FROM users_fts JOIN users u ON u.id = users_fts.rowid
+    WHERE users_fts MATCH ?
+"""
+
+_SQL_SEARCH_LIKE = "SELECT id, username, email FROM users WHERE username LIKE ? OR email LIKE ?"
+
+_SQL_DELETE_USER = "DELETE FROM users WHERE id = ? RETURNING id"
+
+# Trigrams need at least 3 characters; shorter terms fall back to LIKE
+_SEARCH_INDEX_MIN_TERM = 3
+
+# Set once the index exists; search() uses LIKE until then
+_search_index_ready = False
+
+
+def _ensure_search_index(conn: sqlite3.Connection) -> None:
+    """
+    Create the users_fts index and its sync triggers if missing (idempotent).
+
+    Populates the index from users the first time it is created. Failures
+    (e.g. SQLite built without FTS5) are logged and search keeps using LIKE.
+
+    Args:
+        conn (sqlite3.Connection): Connection in autocommit mode
+    """
+    global _search_index_ready
+
+    try:
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users_fts'"
+        ).fetchone()
+
+        with conn:
+            conn.execute("BEGIN")
+            for statement in _SEARCH_INDEX_SCHEMA:
+                conn.execute(statement)
+            if not exists:
+                conn.execute("INSERT INTO users_fts(users_fts) VALUES ('rebuild')")
+
+        _search_index_ready = True
+
+    except sqlite3.Error as e:
+        logger.warning(f"Search index unavailable, falling back to LIKE: {str(e)}")
+
 
 def get_db_connection() -> sqlite3.Connection:
     """
-    Get database connection with proper configuration.
+    Get this thread's database connection, opening it on first use.
 
     Returns:
         sqlite3.Connection: Database connection object
@@ -58,11 +264,25 @@ def get_db_connection() -> sqlite3.Connection:
         sqlite3.Error: If connection fails
 
     Note:
-        Connection should be closed by caller using context manager or explicit close()
+        The connection is cached per thread and must NOT be closed by callers.
+        Use it as `with get_db_connection() as conn:` - sqlite3's context
+        manager commits on success and rolls back on error without closing.
+
+        Rows are plain tuples, which unpack faster than sqlite3.Row name
+        lookups. Set `cursor.row_factory = sqlite3.Row` on a cursor that needs
+        access by column name.
     """
+    conn = getattr(_conn_local, 'conn', None)
+    if conn is not None:
+        return conn
+
     try:
-        conn = sqlite3.connect(DB_NAME)
-        conn.row_factory = sqlite3.Row  # Enable column access by name
+        conn = sqlite3.connect(DB_NAME, check_same_thread=False, isolation_level=None)
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        if not _search_index_ready:
+            _ensure_search_index(conn)
+        _conn_local.conn = conn
         logger.debug(f"Database connection established to {DB_NAME}")
         return conn
     except sqlite3.Error as e:
@@ -70,6 +290,113 @@ def get_db_connection() -> sqlite3.Connection:
         raise
 
 
+# CSPRNG bytes for issue_token(), read from os.urandom 4 KiB at a time so one
+# getrandom() call covers 128 default-size tokens
+_RNG_BUF_SIZE = 4096
+_rng_buf = b""
+_rng_off = 0
+_rng_lock = threading.Lock()
+
+
+def issue_token(nbytes: int = 32) -> str:
+    """
+    Generate a URL-safe token from a buffered CSPRNG.
+
+    SECURITY: Bytes still come from os.urandom, and each byte is handed out
+    exactly once. Forked workers discard the inherited buffer (see
+    _reinit_after_fork) so two processes never issue the same token.
+
+    Args:
+        nbytes (int): Random bytes in the token (default: 32)
+
+    Returns:
+        str: Unpadded base64url token, same format as secrets.token_urlsafe()
+
+    Example:
+        >>> len(issue_token())
+        43
+    """
+    global _rng_buf, _rng_off
+
+    with _rng_lock:
+        if _rng_off + nbytes > len(_rng_buf):
+            _rng_buf = os.urandom(max(_RNG_BUF_SIZE, nbytes))
+            _rng_off = 0
+        raw = _rng_buf[_rng_off:_rng_off + nbytes]
+        _rng_off += nbytes
+
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _reinit_after_fork() -> None:
+    """
+    Rebuild per-process state in a forked worker (gunicorn --preload).
+
+    Threads do not survive fork(), so the child gets its own log queue and
+    listener thread (the parent's queue locks may have been held mid-fork),
+    and drops any SQLite connection inherited from the parent - SQLite
+    connections must never be used across processes. The token buffer is
+    discarded too, or every worker would issue the parent's unused bytes.
+    The token and user caches start empty with fresh locks, since a lock
+    held by another parent thread at fork time would never be released.
+    """
+    global _log_queue, _log_listener, _conn_local, _rng_buf, _rng_off, _rng_lock
+    global _tok_cache, _tok_cache_lock, _user_by_id, _user_cache_lock
+
+    atexit.unregister(_log_listener.stop)
+    _log_queue = queue.Queue(-1)
+    _log_queue_handler.queue = _log_queue
+    _log_listener = logging.handlers.QueueListener(
+        _log_queue, _log_stream_handler, respect_handler_level=True
+    )
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+    _conn_local = threading.local()
+
+    _rng_buf, _rng_off, _rng_lock = b"", 0, threading.Lock()
+
+    _tok_cache = TTLCache(maxsize=10000, ttl=30)
+    _tok_cache_lock = threading.Lock()
+
+    _user_by_id = TTLCache(maxsize=5000, ttl=60)
+    _user_cache_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reinit_after_fork)
+
+
+# Claims of recently validated bearer tokens, keyed by a SHA-256 prefix of the
+# token so the raw credential is never held in memory longer than the request
+_tok_cache: TTLCache = TTLCache(maxsize=10000, ttl=30)
+_tok_cache_lock = threading.Lock()
+
+# (id, username, email) rows recently read by get_user, so a hot working set
+# skips the database. Only found rows are cached. delete_user evicts the entry
+# in this process; other workers may serve a deleted user for up to the 60s TTL.
+# login is not cached: it always reads the password hash fresh.
+_user_by_id: TTLCache = TTLCache(maxsize=5000, ttl=60)
+_user_cache_lock = threading.Lock()
+
+
+def _validate_token(auth_token: str) -> Optional[Dict[str, Any]]:
+    """
+    Validate an Authorization header value and return its claims.
+
+    In production, validate token against database/JWT/session. This is
+    simplified for demonstration.
+
+    Args:
+        auth_token (str): Raw Authorization header value
+
+    Returns:
+        Optional[Dict[str, Any]]: Token claims, or None if the token is invalid
+    """
+    if not auth_token.startswith('Bearer '):
+        return None
+    return {"scheme": "Bearer"}
+
+
 def require_auth(f):
     """
     Decorator to require authentication for protected endpoints.
@@ -89,14 +416,23 @@ def require_auth(f):
 
         if not auth_token:
             logger.warning(f"Unauthorized access attempt to {request.path}")
-            return jsonify({"error": "Authentication required"}), 401
+            return _error_response("Authentication required"), 401
 
-        # In production, validate token against database/JWT/session
-        # This is simplified for demonstration
-        if not auth_token.startswith('Bearer '):
-            logger.warning(f"Invalid authorization format from {request.remote_addr}")
-            return jsonify({"error": "Invalid authentication format"}), 401
+        # Repeat requests with the same token skip validation for up to 30s
+        key = hashlib.sha256(auth_token.encode()).hexdigest()[:32]
+        with _tok_cache_lock:
+            claims = _tok_cache.get(key)
 
+        if claims is None:
+            claims = _validate_token(auth_token)
+            if claims is None:
+                logger.warning(f"Invalid authorization format from {request.remote_addr}")
+                return _error_response("Invalid authentication format"), 401
+
+            with _tok_cache_lock:
+                _tok_cache[key] = claims
+
+        g.auth_claims = claims
         return f(*args, **kwargs)
     return decorated_function
 
@@ -124,36 +460,37 @@ def get_user(user_id: int) -> Tuple[Dict[str, Any], int]:
         {"id": 123, "username": "john_doe", "email": "john@example.com"}
     """
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
+        with _user_cache_lock:
+            user = _user_by_id.get(user_id)
 
-            # SECURITY: Parameterized query prevents SQL injection
-            cursor.execute(
-                "SELECT id, username, email FROM users WHERE id = ?",
-                (user_id,)
-            )
-
-            user = cursor.fetchone()
-
-            if user:
-                logger.info(f"User {user_id} retrieved successfully")
-                return jsonify({
-                    "id": user['id'],
-                    "username": user['username'],
-                    "email": user['email']
-                }), 200
-            else:
+        if user is None:
+            with get_db_connection() as conn:
+                # SECURITY: Parameterized query prevents SQL injection
+                user = conn.execute(_SQL_GET_USER, (user_id,)).fetchone()
+
+            if user is None:
                 logger.warning(f"User {user_id} not found")
-                return jsonify({"error": "User not found"}), 404
+                return _error_response("User not found"), 404
+
+            with _user_cache_lock:
+                _user_by_id[user_id] = user
+
+        found_id, username, email = user
+        logger.info(f"User {user_id} retrieved successfully")
+        return jsonify({
+            "id": found_id,
+            "username": username,
+            "email": email
+        }), 200
 
     except sqlite3.Error as e:
         # CONTEXT_IN_ERRORS: Include operation details without exposing sensitive data
         logger.error(f"Database error retrieving user {user_id}: {str(e)}")
-        return jsonify({"error": "Database error occurred"}), 500
+        return _error_response("Database error occurred"), 500
 
     except Exception as e:
         logger.error(f"Unexpected error retrieving user {user_id}: {str(e)}", exc_info=True)
-        return jsonify({"error": "Internal server error"}), 500
+        return _error_response("Internal server error"), 500
 
 
 @app.route('/login', methods=['POST'])
@@ -182,63 +519,72 @@ def login() -> Tuple[Dict[str, Any], int]:
         # Validate input
         if not request.is_json:
             logger.warning("Login attempt with non-JSON content type")
-            return jsonify({"error": "Content-Type must be application/json"}), 400
+            return _error_response("Content-Type must be application/json"), 400
+
+        # Parsed once by the orjson provider; malformed JSON yields None instead
+        # of raising, and the body is not cached on the request
+        data = request.get_json(silent=True, cache=False)
+        if not isinstance(data, dict):
+            logger.warning(f"Login attempt with non-object JSON body from {request.remote_addr}")
+            return _error_response("Username and password required"), 400
 
-        data = request.get_json()
         username = data.get('username')
         password = data.get('password')
 
-        # Input validation
-        if not username or not password:
+        # Input validation - all cheap checks run before any database or hashing work
+        if not username or not password or type(username) is not str or type(password) is not str:
             logger.warning(f"Login attempt with missing credentials from {request.remote_addr}")
-            return jsonify({"error": "Username and password required"}), 400
+            return _error_response("Username and password required"), 400
 
         if len(username) > 100 or len(password) > 200:
             logger.warning(f"Login attempt with oversized input from {request.remote_addr}")
-            return jsonify({"error": "Invalid input length"}), 400
+            return _error_response("Invalid input length"), 400
 
         with get_db_connection() as conn:
-            cursor = conn.cursor()
-
             # SECURITY: Parameterized query prevents SQL injection
-            cursor.execute(
-                "SELECT id, username, password_hash FROM users WHERE username = ?",
-                (username,)
-            )
-
-            user = cursor.fetchone()
-
-            if user:
-                # Import here to allow utils.py to use proper password verification
-                from utils import verify_password
-
-                # SECURITY: Verify password using secure hashing
-                if verify_password(user['password_hash'], password):
-                    logger.info(f"Successful login for user {user['username']}")
-
-                    # In production, generate actual JWT or session token
-                    token = secrets.token_urlsafe(32)
-
-                    return jsonify({
-                        "success": True,
-                        "message": "Login successful",
-                        "token": token
-                    }), 200
-                else:
-                    logger.warning(f"Failed login attempt for user {username} - invalid password")
-                    return jsonify({"error": "Invalid credentials"}), 401
-            else:
-                # Use same message as wrong password to prevent user enumeration
-                logger.warning(f"Failed login attempt for non-existent user {username}")
-                return jsonify({"error": "Invalid credentials"}), 401
+            # (id, username, password_hash) or None
+            user = conn.execute(_SQL_LOGIN, (username,)).fetchone()
+
+        # SECURITY: Verify password using secure hashing. Unknown users are
+        # checked against a dummy hash so timing does not reveal which
+        # usernames exist.
+        if verify_password_or_dummy(user[2] if user else None, password):
+            logger.info(f"Successful login for user {user[1]}")
+
+            # Move hashes made with older Argon2 parameters onto the current
+            # ones, so a wrong password costs the same as an unknown user
+            new_hash = rehash_if_needed(user[2], password)
+            if new_hash:
+                try:
+                    with get_db_connection() as conn:
+                        conn.execute(_SQL_REHASH, (new_hash, user[0], user[2]))
+                except sqlite3.Error as e:
+                    # The login itself succeeded; retry the upgrade next time
+                    logger.warning(f"Failed to upgrade password hash for user {user[0]}: {str(e)}")
+
+            # In production, generate actual JWT or session token
+            token = issue_token()
+
+            return jsonify({
+                "success": True,
+                "message": "Login successful",
+                "token": token
+            }), 200
+        elif user:
+            logger.warning(f"Failed login attempt for user {username} - invalid password")
+            return _error_response("Invalid credentials"), 401
+        else:
+            # Use same message as wrong password to prevent user enumeration
+            logger.warning(f"Failed login attempt for non-existent user {username}")
+            return _error_response("Invalid credentials"), 401
 
     except sqlite3.Error as e:
         logger.error(f"Database error during login: {str(e)}")
-        return jsonify({"error": "Database error occurred"}), 500
+        return _error_response("Database error occurred"), 500
 
     except Exception as e:
         logger.error(f"Unexpected error during login: {str(e)}", exc_info=True)
-        return jsonify({"error": "Internal server error"}), 500
+        return _error_response("Internal server error"), 500
 
 
 @app.route('/search', methods=['GET'])
@@ -267,46 +613,47 @@ def search() -> Tuple[Dict[str, Any], int]:
         # Input validation
         if not search_term:
             logger.warning("Search attempted with empty query")
-            return jsonify({"error": "Search term required"}), 400
+            return _error_response("Search term required"), 400
 
         if len(search_term) > 100:
             logger.warning(f"Search attempted with oversized query from {request.remote_addr}")
-            return jsonify({"error": "Search term too long"}), 400
+            return _error_response("Search term too long"), 400
 
         # Additional validation: alphanumeric and common characters only
-        import re
-        if not re.match(r'^[a-zA-Z0-9\s\-_.@]+$', search_term):
+        if not _SEARCH_RE.match(search_term):
             logger.warning(f"Search attempted with invalid characters: {search_term}")
-            return jsonify({"error": "Invalid characters in search term"}), 400
+            return _error_response("Invalid characters in search term"), 400
 
         with get_db_connection() as conn:
-            cursor = conn.cursor()
-
-            # SECURITY: Parameterized query prevents SQL injection
-            # Use LIKE with proper escaping
-            cursor.execute(
-                "SELECT id, username, email FROM users WHERE username LIKE ? OR email LIKE ?",
-                (f'%{search_term}%', f'%{search_term}%')
-            )
+            # SECURITY: Parameterized query prevents SQL injection. The term is
+            # passed as a quoted FTS5 phrase, so it cannot inject query syntax.
+            if _search_index_ready and len(search_term) >= _SEARCH_INDEX_MIN_TERM:
+                cursor = conn.execute(
+                    _SQL_SEARCH_FTS, ('"' + search_term.replace('"', '""') + '"',)
+                )
+            else:
+                # Use LIKE with proper escaping
+                cursor = conn.execute(
+                    _SQL_SEARCH_LIKE, (f'%{search_term}%', f'%{search_term}%')
+                )
 
-            results = cursor.fetchall()
+            # Build response dicts straight from the cursor; no fetchall() buffer
+            results = [
+                {"id": row[0], "username": row[1], "email": row[2]}
+                for row in cursor
+            ]
 
             logger.info(f"Search for '{search_term}' returned {len(results)} results")
 
-            return jsonify({
-                "results": [
-                    {"id": row['id'], "username": row['username'], "email": row['email']}
-                    for row in results
-                ]
-            }), 200
+            return jsonify({"results": results}), 200
 
     except sqlite3.Error as e:
         logger.error(f"Database error during search: {str(e)}")
-        return jsonify({"error": "Database error occurred"}), 500
+        return _error_response("Database error occurred"), 500
 
     except Exception as e:
         logger.error(f"Unexpected error during search: {str(e)}", exc_info=True)
-        return jsonify({"error": "Internal server error"}), 500
+        return _error_response("Internal server error"), 500
 
 
 @app.route('/admin/delete/<int:user_id>', methods=['DELETE'])
@@ -337,33 +684,34 @@ def delete_user(user_id: int) -> Tuple[Dict[str, Any], int]:
         # This is simplified for demonstration
 
         with get_db_connection() as conn:
-            cursor = conn.cursor()
-
-            # Check if user exists first
-            cursor.execute("SELECT id FROM users WHERE id = ?", (user_id,))
-            user = cursor.fetchone()
+            # SECURITY: Parameterized query prevents SQL injection
+            # RETURNING reports whether a row existed in the same statement,
+            # so there is no window between an existence check and the delete
+            deleted = conn.execute(_SQL_DELETE_USER, (user_id,)).fetchone()
 
-            if not user:
+            if deleted is None:
                 logger.warning(f"Attempted to delete non-existent user {user_id}")
-                return jsonify({"error": "User not found"}), 404
+                return _error_response("User not found"), 404
 
-            # SECURITY: Parameterized query prevents SQL injection
-            cursor.execute("DELETE FROM users WHERE id = ?", (user_id,))
             conn.commit()
 
-            logger.info(f"User {user_id} deleted successfully")
-            return jsonify({
-                "success": True,
-                "message": "User deleted"
-            }), 200
+        # Drop the deleted user from this worker's cache
+        with _user_cache_lock:
+            _user_by_id.pop(user_id, None)
+
+        logger.info(f"User {user_id} deleted successfully")
+        return jsonify({
+            "success": True,
+            "message": "User deleted"
+        }), 200
 
     except sqlite3.Error as e:
         logger.error(f"Database error deleting user {user_id}: {str(e)}")
-        return jsonify({"error": "Database error occurred"}), 500
+        return _error_response("Database error occurred"), 500
 
     except Exception as e:
         logger.error(f"Unexpected error deleting user {user_id}: {str(e)}", exc_info=True)
-        return jsonify({"error": "Internal server error"}), 500
+        return _error_response("Internal server error"), 500
 
 
 def send_email(recipient: str, subject: str, body: str) -> Dict[str, Any]:
@@ -396,9 +744,7 @@ def send_email(recipient: str, subject: str, body: str) -> Dict[str, Any]:
     if not all([recipient, subject, body]):
         raise ValueError("recipient, subject, and body are required")
 
-    import re
-    email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    if not re.match(email_regex, recipient):
+    if not _EMAIL_RE.match(recipient):
         raise ValueError(f"Invalid email address: {recipient}")
 
     # SECURITY: Use environment variable for API key
@@ -413,21 +759,9 @@ def send_email(recipient: str, subject: str, body: str) -> Dict[str, Any]:
         'body': body
     }
 
-    # Configure retry strategy for transient failures
-    retry_strategy = Retry(
-        total=3,
-        backoff_factor=1,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["POST"]
-    )
-
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session = requests.Session()
-    session.mount("https://", adapter)
-
     try:
         # SECURITY: Include timeout to prevent hanging (ERROR_HANDLING)
-        response = session.post(
+        response = _email_session.post(
             EMAIL_SERVICE_URL,
             headers=headers,
             json=data,
@@ -455,9 +789,6 @@ def send_email(recipient: str, subject: str, body: str) -> Dict[str, Any]:
         logger.error(f"Unexpected error sending email to {recipient}: {str(e)}")
         raise
 
-    finally:
-        session.close()
-
 
 @app.route('/health', methods=['GET'])
 def health_check() -> Tuple[Dict[str, Any], int]:
@@ -474,14 +805,9 @@ def health_check() -> Tuple[Dict[str, Any], int]:
     try:
         # Check database connectivity
         with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1")
-            cursor.fetchone()
+            conn.execute("SELECT 1").fetchone()
 
-        return jsonify({
-            "status": "healthy",
-            "database": "connected"
-        }), 200
+        return _json_response(_HEALTHY_BODY), 200
 
     except Exception as e:
         logger.error(f"Health check failed: {str(e)}")
@@ -499,8 +825,15 @@ if __name__ == '__main__':
     flask_host = os.getenv('FLASK_HOST', '127.0.0.1')  # Localhost only by default
     flask_port = int(os.getenv('FLASK_PORT', '5000'))
 
-    if flask_env == 'production' and flask_debug:
-        logger.warning("Debug mode should not be enabled in production!")
+    # The Werkzeug development server is neither hardened nor built for
+    # production load; production traffic belongs on a pre-forking WSGI server
+    if flask_env != 'development':
+        logger.error(
+            "Refusing to start the Flask development server with FLASK_ENV=%s. Run under a "
+            "WSGI server instead: gunicorn -w $(nproc) -k gthread --threads 8 --preload app:app",
+            flask_env
+        )
+        raise SystemExit(1)
 
     logger.info(f"Starting Flask application on {flask_host}:{flask_port} (env: {flask_env})")
 
@@ -4,21 +4,335 @@ Demonstrates proper data access patterns following CLAUDE.md rules
 """
 
 import sqlite3
+import asyncio
+import atexit
+import base64
+import hashlib
+import hmac
 import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, List
 from contextlib import contextmanager
-from utils import hash_password, verify_password, generate_token
+from dataclasses import dataclass, field
+from cachetools import TTLCache
+from argon2 import PasswordHasher
+from argon2 import low_level as argon2_low_level
+import utils
+from utils import hash_password, verify_password, verify_password_async
 
 logger = logging.getLogger(__name__)
 
+DB_PATH = 'users.db'
+
+# Per-connection tuning applied once when a connection is opened
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",     # Readers do not block the writer
+    "PRAGMA synchronous=NORMAL",   # Safe with WAL, avoids an fsync per commit
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",    # ~64 MB page cache, kept warm across calls
+    "PRAGMA cache_spill=OFF",      # Keep dirty pages in cache mid-transaction
+    "PRAGMA foreign_keys=ON",      # Deleting a user cascades to their sessions
+)
+
+# Sessions store only a BLAKE2b digest of the token, never the token itself
+_SESSIONS_TABLE = """
+    CREATE TABLE {name} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        token_hash TEXT NOT NULL,
+        created_at INTEGER NOT NULL,
+        expires_at INTEGER NOT NULL
+    )
+"""
+
+# Timestamps are stored as INTEGER Unix epoch seconds so expiry checks are
+# integer compares against unixepoch() (SQLite >= 3.38). The models convert
+# to and from datetime explicitly (_to_epoch/_from_epoch) rather than through
+# sqlite3's process-wide adapter/converter registry.
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT NOT NULL UNIQUE,
+        password_hash TEXT NOT NULL,
+        email TEXT NOT NULL UNIQUE,
+        created_at INTEGER NOT NULL
+    )
+    """,
+    _SESSIONS_TABLE.format(name="IF NOT EXISTS sessions"),
+)
+
+# Schema version recorded in PRAGMA user_version once the migrations below ran
+_SCHEMA_VERSION = 1
+
+# Version 1: older databases stored ISO-8601 text in local time; convert them
+# in place. Each UPDATE scans its table, so it runs only once per database.
+_EPOCH_MIGRATION = (
+    "UPDATE users SET created_at = unixepoch(created_at, 'utc') WHERE typeof(created_at) = 'text'",
+    """
+    UPDATE sessions
+    SET created_at = unixepoch(created_at, 'utc'), expires_at = unixepoch(expires_at, 'utc')
+    WHERE typeof(expires_at) = 'text'
+    """,
+)
+
+# Auth lookups are index seeks rather than table scans
+_SCHEMA_INDEXES = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_users_username ON users(username)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_sessions_token_hash ON sessions(token_hash)",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_at)",
+)
+
+
+# Hot-path statements. Kept as constants so the SQL text is identical on every
+# call and hits the per-connection statement cache; each connection prepares
+# them up front (see _ConnectionPool._open).
+_SQL_FIND_USER_BY_USERNAME = """
+    SELECT id, username, password_hash, email, created_at
+    FROM users
+    WHERE username = ?
+"""
+
+_SQL_FIND_USER_BY_ID = """
+    SELECT id, username, password_hash, email, created_at
+    FROM users
+    WHERE id = ?
+"""
+
+_SQL_FIND_SESSION_BY_TOKEN = """
+    SELECT id, user_id, created_at, expires_at
+    FROM sessions
+    WHERE token_hash = ? AND expires_at > unixepoch()
+"""
+
+# Statements to prepare on each new connection, with parameters that match nothing
+_PREPARED_STATEMENTS = (
+    (_SQL_FIND_USER_BY_USERNAME, ('',)),
+    (_SQL_FIND_USER_BY_ID, (0,)),
+    (_SQL_FIND_SESSION_BY_TOKEN, ('',)),
+)
+
+
+def _to_epoch(value: datetime) -> int:
+    """Convert a datetime to the Unix epoch seconds stored in timestamp columns."""
+    return int(value.timestamp())
+
+
+def _from_epoch(value: int) -> datetime:
+    """
+    Read an epoch-seconds timestamp column back as a local datetime.
+
+    Legacy tables declare created_at TEXT, whose affinity stores the migrated
+    epoch as a numeric string, so the value is passed through int().
+    """
+    return datetime.fromtimestamp(int(value))
+
+
+def _new_session_token() -> str:
+    """
+    Generate a 32-byte URL-safe session token.
+
+    One getrandom() syscall plus C base64 encoding; same output format as
+    secrets.token_urlsafe(32) without generate_token()'s clamping and logging.
+    """
+    return base64.urlsafe_b64encode(os.urandom(32)).rstrip(b"=").decode("ascii")
+
+
+def _hash_token(token: str) -> str:
+    """
+    Digest a session token for storage and lookup.
+
+    Lookups compare fixed-length digests, so neither SQLite's bytewise compare
+    nor the in-process cache can leak how much of a guessed token matched.
+    """
+    return hashlib.blake2b(token.encode(), digest_size=32).hexdigest()
+
+
+def _sessions_migrated(conn: sqlite3.Connection) -> bool:
+    """Return True if the sessions table already stores token digests."""
+    return any(row[1] == 'token_hash' for row in conn.execute("PRAGMA table_info(sessions)"))
+
+
+def _migrate_session_tokens(conn: sqlite3.Connection) -> None:
+    """
+    Rebuild a sessions table that still stores raw tokens to store digests.
+
+    Follows SQLite's table-rebuild procedure: foreign keys are switched off
+    for the rebuild (they cannot be toggled inside a transaction) and
+    restored afterwards. Sessions whose user no longer exists are dropped
+    rather than carried into the ON DELETE CASCADE table.
+    """
+    if _sessions_migrated(conn):
+        return
+
+    conn.create_function("hash_token", 1, _hash_token, deterministic=True)
+    conn.execute("PRAGMA foreign_keys=OFF")
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        # Re-check under the write lock in case another process migrated meanwhile
+        if _sessions_migrated(conn):
+            conn.commit()
+            return
+        conn.execute("ALTER TABLE sessions RENAME TO sessions_legacy")
+        conn.execute(_SESSIONS_TABLE.format(name="sessions"))
+        conn.execute(
+            """
+            INSERT INTO sessions (id, user_id, token_hash, created_at, expires_at)
+            SELECT id, user_id, hash_token(token), created_at, expires_at FROM sessions_legacy
+            WHERE user_id IN (SELECT id FROM users)
+            """
+        )
+        conn.execute("DROP TABLE sessions_legacy")
+        conn.commit()
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        conn.execute("PRAGMA foreign_keys=ON")
+    logger.info("Migrated sessions table to hashed tokens")
+
+
+def _migrate_timestamps(conn: sqlite3.Connection) -> None:
+    """Convert text timestamps to epoch seconds unless user_version says it is done."""
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= _SCHEMA_VERSION:
+        return
+
+    conn.execute("BEGIN IMMEDIATE")
+    # Re-check under the write lock in case another process migrated meanwhile
+    if conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+        for statement in _EPOCH_MIGRATION:
+            conn.execute(statement)
+        conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+    conn.commit()
+
+
+def _ensure_schema(conn: sqlite3.Connection) -> None:
+    """Create tables and indexes if they do not exist yet (idempotent)."""
+    for statement in _SCHEMA:
+        conn.execute(statement)
+    conn.commit()
+
+    _migrate_timestamps(conn)
+    _migrate_session_tokens(conn)
+
+    for statement in _SCHEMA_INDEXES:
+        conn.execute(statement)
+    conn.commit()
+
+
+class _ConnectionPool:
+    """
+    One long-lived SQLite connection per thread.
+
+    Opening a connection per query discards SQLite's page cache on every
+    close. Each thread instead opens its connection lazily on first use and
+    keeps it for its lifetime, so threaded app servers get one warm
+    connection per worker thread. Connections of threads that have exited are
+    closed when the next connection is opened.
+
+    Args:
+        database (str): Path to the SQLite database file
+    """
+
+    def __init__(self, database: str):
+        self.database = database
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: dict = {}  # threading.Thread -> sqlite3.Connection
+        self._schema_ready = False
+
+    def _open(self) -> sqlite3.Connection:
+        """Open and configure a new connection."""
+        conn = sqlite3.connect(
+            self.database,
+            check_same_thread=False  # Closed from other threads on shutdown
+        )
+        conn.row_factory = sqlite3.Row  # Enable column access by name
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+
+        try:
+            with self._lock:
+                if not self._schema_ready:
+                    _ensure_schema(conn)
+                    self._schema_ready = True
+
+            # Parse and plan hot statements once so request paths hit the cache
+            for sql, params in _PREPARED_STATEMENTS:
+                conn.execute(sql, params).fetchall()
+        except BaseException:
+            # Never hand out (or leak) a connection still holding a write lock
+            conn.rollback()
+            conn.close()
+            raise
+
+        return conn
+
+    def get(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            with self._lock:
+                for thread in [t for t in self._connections if not t.is_alive()]:
+                    self._connections.pop(thread).close()
+                self._connections[threading.current_thread()] = conn
+                logger.debug("Opened connection %d to %s", len(self._connections), self.database)
+        return conn
+
+    def close(self) -> None:
+        """Close every connection opened by this pool."""
+        with self._lock:
+            for conn in self._connections.values():
+                conn.close()
+            self._connections.clear()
+
+
+_POOL: Optional[_ConnectionPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool() -> _ConnectionPool:
+    """Create the module-level pool on first use."""
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = _ConnectionPool(DB_PATH)
+    return _POOL
+
+
+def close_pool() -> None:
+    """
+    Close all per-thread database connections.
+
+    Registered with atexit; can also be called explicitly on shutdown. A new
+    pool is created on next use.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.close()
+            _POOL = None
+
+
+atexit.register(close_pool)
+
 
 @contextmanager
 def get_db():
     """
     Context manager for database connections (ERROR_HANDLING).
 
-    Ensures connections are properly closed even if exceptions occur.
+    Yields the calling thread's persistent connection. The connection is not
+    closed on exit; if the block raises, its transaction is rolled back, and
+    any transaction left uncommitted by the outermost block is discarded.
 
     Yields:
         sqlite3.Connection: Database connection
@@ -28,14 +342,196 @@ def get_db():
         ...     cursor = conn.cursor()
         ...     cursor.execute("SELECT * FROM users")
     """
-    conn = sqlite3.connect('users.db')
-    conn.row_factory = sqlite3.Row  # Enable column access by name
+    pool = _get_pool()
+    conn = pool.get()
+    local = pool._local
+    local.depth = getattr(local, 'depth', 0) + 1
     try:
         yield conn
+    except BaseException:
+        conn.rollback()
+        raise
     finally:
-        conn.close()
+        local.depth -= 1
+        if local.depth == 0 and conn.in_transaction:
+            conn.rollback()
+
+
+# Returned by _db_call() when the database operation failed
+_DB_FAILED = object()
+
+
+def _db_call(op_name: str, context: object, fn, *args):
+    """
+    Run a database operation with the module's single error handler.
+
+    Args:
+        op_name (str): What is being done, e.g. "create user" (for logs)
+        context (object): Identifying detail for the log line (CONTEXT_IN_ERRORS)
+        fn: Callable performing the operation
+        *args: Arguments passed to fn
+
+    Returns:
+        fn's return value, or _DB_FAILED if it raised sqlite3.Error
+
+    Note:
+        Constraint violations (duplicates) log at WARNING, other database
+        errors at ERROR. Arguments are formatted lazily by logging, so nothing
+        is built when the level is filtered. Non-database exceptions are bugs
+        and propagate.
+    """
+    try:
+        return fn(*args)
+    except sqlite3.Error as e:
+        level = logging.WARNING if isinstance(e, sqlite3.IntegrityError) else logging.ERROR
+        logger.log(level, "Failed to %s (%s): %s", op_name, context, e)
+        return _DB_FAILED
+
+
+def _fetch_one(sql: str, params: tuple) -> Optional[sqlite3.Row]:
+    """Run a read query and return its first row."""
+    with get_db() as conn:
+        return conn.execute(sql, params).fetchone()
+
+
+# The async password helpers hand Argon2 work to threads, which only run in
+# parallel because argon2-cffi releases the GIL inside its C extension. Fail
+# fast if utils is ever pointed at a hasher without native bindings.
+if not isinstance(utils.ph, PasswordHasher) or not hasattr(argon2_low_level, 'verify_secret'):
+    raise ImportError("utils.verify_password must be backed by argon2-cffi (argon2.low_level)")
+
+
+# Read-through cache for user lookups, keyed by ('username', name) and ('id', id).
+# Entries hold plain row tuples, including password_hash, and expire after 5s.
+# The cache is per-process: save()/update_password() only evict it in the
+# process that made the change, so other workers can accept an old password
+# until their entry expires. Keep the TTL short.
+_USER_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=5)
+_USER_CACHE_LOCK = threading.RLock()
+
+
+def _cache_user_row(row: tuple) -> None:
+    """Store a (id, username, password_hash, email, created_at) row under both keys."""
+    with _USER_CACHE_LOCK:
+        _USER_CACHE[('id', row[0])] = row
+        _USER_CACHE[('username', row[1])] = row
+
 
+def _cached_user_row(key: tuple) -> Optional[tuple]:
+    """Return the cached row for key, or None on miss/expiry."""
+    with _USER_CACHE_LOCK:
+        return _USER_CACHE.get(key)
 
+
+def _invalidate_user(user_id: Optional[int], username: Optional[str]) -> None:
+    """Drop cached rows for a user after it has been written."""
+    with _USER_CACHE_LOCK:
+        _USER_CACHE.pop(('id', user_id), None)
+        _USER_CACHE.pop(('username', username), None)
+
+
+# Token hash -> (Session, monotonic expiry) for repeat lookups of the same token.
+# TTL is capped at 60s so revocations from other processes propagate quickly;
+# revoke() in this process evicts immediately. LRU-bounded to 10k entries.
+_SESSION_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_SESSION_CACHE_LOCK = threading.Lock()
+_SESSION_CACHE_MAX = 10000
+_SESSION_CACHE_TTL = 60.0
+
+# Session IDs per DELETE ... IN (...) statement, below SQLite's parameter limit
+_REVOKE_BATCH_SIZE = 500
+
+
+def _cache_session(token_hash: str, session: 'Session') -> None:
+    """Cache a session until min(60s, time left before it expires)."""
+    ttl = min((session.expires_at - datetime.now()).total_seconds(), _SESSION_CACHE_TTL)
+    if ttl <= 0:
+        return
+    with _SESSION_CACHE_LOCK:
+        _SESSION_CACHE[token_hash] = (session, time.monotonic() + ttl)
+        _SESSION_CACHE.move_to_end(token_hash)
+        if len(_SESSION_CACHE) > _SESSION_CACHE_MAX:
+            _SESSION_CACHE.popitem(last=False)
+
+
+def _cached_session(token: str, token_hash: str) -> Optional['Session']:
+    """Return the cached session for token if it is still fresh and valid."""
+    with _SESSION_CACHE_LOCK:
+        entry = _SESSION_CACHE.get(token_hash)
+        if entry is None:
+            return None
+        session, expiry = entry
+        if time.monotonic() < expiry and session.is_valid():
+            _SESSION_CACHE.move_to_end(token_hash)
+            # SECURITY: Constant-time compare of the presented token
+            if hmac.compare_digest(session.token, token):
+                return session
+            return None
+        del _SESSION_CACHE[token_hash]
+        return None
+
+
+def _invalidate_session(token_hash: str) -> None:
+    """Evict a token hash from the session cache."""
+    with _SESSION_CACHE_LOCK:
+        _SESSION_CACHE.pop(token_hash, None)
+
+
+# save_async() pipeline: Argon2 on _HASH_POOL, inserts batched by one writer thread
+_HASH_POOL = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="argon2")
+_SAVE_QUEUE: "queue.Queue[tuple]" = queue.Queue()
+_SAVE_BATCH_SIZE = 200
+_SAVE_FLUSH_INTERVAL = 0.05  # seconds
+_SAVE_WRITER: Optional[threading.Thread] = None
+_SAVE_WRITER_LOCK = threading.Lock()
+
+
+def _start_save_writer() -> None:
+    """Start the save_async() writer thread if it is not running."""
+    global _SAVE_WRITER
+    with _SAVE_WRITER_LOCK:
+        if _SAVE_WRITER is None or not _SAVE_WRITER.is_alive():
+            _SAVE_WRITER = threading.Thread(target=_save_writer, name="user-writer", daemon=True)
+            _SAVE_WRITER.start()
+
+
+def _save_writer() -> None:
+    """Drain queued users, flushing every _SAVE_BATCH_SIZE rows or _SAVE_FLUSH_INTERVAL."""
+    while True:
+        batch = [_SAVE_QUEUE.get()]
+        deadline = time.monotonic() + _SAVE_FLUSH_INTERVAL
+        while len(batch) < _SAVE_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_SAVE_QUEUE.get(timeout=remaining))
+            except queue.Empty:
+                break
+        _flush_save_batch(batch)
+
+
+def _flush_save_batch(batch: list) -> None:
+    """Insert one batch of (user, future) pairs and resolve the futures."""
+    users = [user for user, _ in batch]
+    try:
+        User._insert_batch(users, "BEGIN IMMEDIATE")
+        logger.info("Saved %d users in one batch", len(users))
+        for _, future in batch:
+            future.set_result(True)
+
+    except sqlite3.IntegrityError:
+        # A duplicate somewhere in the batch; retry row by row so only it fails
+        for user, future in batch:
+            future.set_result(user.save())
+
+    except sqlite3.Error as e:
+        logger.error("Failed to save batch (%d users): %s", len(users), e)
+        for _, future in batch:
+            future.set_result(False)
+
+
+@dataclass(slots=True, eq=False)
 class User:
     """
     User model with secure password handling and parameterized queries.
@@ -54,29 +550,15 @@ class User:
         created_at (datetime): Account creation timestamp
     """
 
-    def __init__(
-        self,
-        id: Optional[int] = None,
-        username: str = "",
-        password_hash: str = "",
-        email: str = "",
-        created_at: Optional[datetime] = None
-    ):
-        """
-        Initialize User instance.
+    id: Optional[int] = None
+    username: str = ""
+    password_hash: str = field(default="", repr=False)
+    email: str = ""
+    created_at: Optional[datetime] = None
 
-        Args:
-            id (int, optional): User ID (None for new users)
-            username (str): Username
-            password_hash (str): Argon2 password hash
-            email (str): Email address
-            created_at (datetime, optional): Creation timestamp
-        """
-        self.id = id
-        self.username = username
-        self.password_hash = password_hash
-        self.email = email
-        self.created_at = created_at or datetime.now()
+    def __post_init__(self) -> None:
+        if self.created_at is None:
+            self.created_at = datetime.now()
 
     def save(self) -> bool:
         """
@@ -100,7 +582,39 @@ class User:
             >>> user.save()
             True
         """
-        # Validate inputs
+        self._validate()
+
+        def _insert() -> int:
+            with get_db() as conn:
+                # SECURITY: Parameterized query prevents SQL injection
+                cursor = conn.execute(
+                    """
+                    INSERT INTO users (username, password_hash, email, created_at)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    (self.username, self.password_hash, self.email, _to_epoch(self.created_at))
+                )
+                conn.commit()
+                return cursor.lastrowid
+
+        # Duplicate username/email surfaces as IntegrityError -> False
+        user_id = _db_call("create user", self.username, _insert)
+        if user_id is _DB_FAILED:
+            return False
+
+        self.id = user_id
+        _invalidate_user(self.id, self.username)
+
+        logger.info("User '%s' created successfully (ID: %s)", self.username, self.id)
+        return True
+
+    def _validate(self) -> None:
+        """
+        Validate fields before insertion.
+
+        Raises:
+            ValueError: If validation fails
+        """
         if not self.username or len(self.username) > 50:
             raise ValueError("Username must be between 1-50 characters")
 
@@ -110,37 +624,129 @@ class User:
         if not self.password_hash:
             raise ValueError("Password hash is required. Call set_password() first.")
 
-        try:
-            with get_db() as conn:
-                cursor = conn.cursor()
+    @staticmethod
+    def bulk_create(users: List['User']) -> List[int]:
+        """
+        Insert many users in a single transaction.
 
-                # SECURITY: Parameterized query prevents SQL injection
-                cursor.execute(
-                    """
-                    INSERT INTO users (username, password_hash, email, created_at)
-                    VALUES (?, ?, ?, ?)
-                    """,
-                    (self.username, self.password_hash, self.email, self.created_at)
-                )
+        One commit for the whole batch instead of one per row, so imports are
+        bound by password hashing rather than disk syncs. All users are
+        validated before anything is written; the batch is all-or-nothing.
 
-                conn.commit()
-                self.id = cursor.lastrowid
+        Args:
+            users (List[User]): Users with password already set
 
-                logger.info(f"User '{self.username}' created successfully (ID: {self.id})")
-                return True
+        Returns:
+            List[int]: New user IDs in input order (empty list on failure)
 
-        except sqlite3.IntegrityError as e:
-            # Username or email already exists
-            logger.warning(f"Failed to create user '{self.username}': {str(e)}")
-            return False
+        Raises:
+            ValueError: If any user fails validation
 
-        except sqlite3.Error as e:
-            logger.error(f"Database error creating user '{self.username}': {str(e)}")
-            return False
+        Example:
+            >>> users = [User(username=n, email=f"{n}@example.com") for n in ("ann", "bob")]
+            >>> for u in users:
+            ...     u.set_password("SecurePass123!")
+            >>> User.bulk_create(users)
+            [1, 2]
+        """
+        if not users:
+            return []
 
-        except Exception as e:
-            logger.error(f"Unexpected error creating user '{self.username}': {str(e)}")
-            return False
+        for user in users:
+            user._validate()
+
+        ids = _db_call("bulk create users", f"{len(users)} users",
+                       User._insert_batch, users, "BEGIN")
+        if ids is _DB_FAILED:
+            return []
+
+        logger.info("Bulk created %d users", len(users))
+        return ids
+
+    @staticmethod
+    def _insert_batch(users: List['User'], begin: str) -> List[int]:
+        """
+        Insert validated users with executemany inside one transaction.
+
+        Args:
+            users (List[User]): Validated users to insert
+            begin (str): Statement that opens the transaction
+
+        Returns:
+            List[int]: New user IDs in input order
+
+        Raises:
+            sqlite3.Error: If the insert fails (nothing is written)
+        """
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(begin)
+
+            # SECURITY: Parameterized query prevents SQL injection
+            cursor.executemany(
+                """
+                INSERT INTO users (username, password_hash, email, created_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                [(u.username, u.password_hash, u.email, _to_epoch(u.created_at))
+                 for u in users]
+            )
+
+            # Rowids are assigned sequentially while we hold the write lock
+            last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+            conn.commit()
+
+        first_id = last_id - len(users) + 1
+        for offset, user in enumerate(users):
+            user.id = first_id + offset
+            _invalidate_user(user.id, user.username)
+
+        return [user.id for user in users]
+
+    def save_async(self, plain_password: str) -> 'Future[bool]':
+        """
+        Hash the password and save the user through a pipelined writer.
+
+        Argon2 runs on a worker thread; finished rows are queued for a single
+        writer thread that inserts them in batches (up to 200 rows or 50 ms)
+        under one BEGIN IMMEDIATE transaction. While one batch commits, the
+        next users are still hashing, so disk syncs hide behind hashing.
+
+        Args:
+            plain_password (str): Plain text password
+
+        Returns:
+            Future[bool]: Resolves to save()'s result once the row is written;
+            raises ValueError if validation fails
+
+        Raises:
+            ValueError: If password is invalid
+
+        Example:
+            >>> futures = [u.save_async("SecurePass123!") for u in new_users]
+            >>> all(f.result() for f in futures)
+            True
+
+        Note:
+            The writer is a daemon thread; wait on the returned futures before
+            the process exits.
+        """
+        User._check_new_password(plain_password)
+
+        result: 'Future[bool]' = Future()
+
+        def _hashed(hash_future: 'Future[str]') -> None:
+            try:
+                self.password_hash = hash_future.result()
+                self._validate()
+            except Exception as e:
+                result.set_exception(e)
+                return
+            _SAVE_QUEUE.put((self, result))
+
+        _start_save_writer()
+        _HASH_POOL.submit(hash_password, plain_password).add_done_callback(_hashed)
+        return result
 
     def set_password(self, plain_password: str) -> None:
         """
@@ -158,15 +764,45 @@ class User:
             >>> user = User(username="john", email="john@example.com")
             >>> user.set_password("SecurePass123!")
         """
+        User._check_new_password(plain_password)
+
+        self.password_hash = hash_password(plain_password)
+        logger.debug("Password set for user '%s'", self.username)
+
+    async def set_password_async(self, plain_password: str) -> None:
+        """
+        Set user password without blocking the event loop.
+
+        Same as set_password(), but Argon2 hashing runs on a worker thread.
+
+        Args:
+            plain_password (str): Plain text password
+
+        Raises:
+            ValueError: If password is invalid
+
+        Example:
+            >>> await user.set_password_async("SecurePass123!")
+        """
+        User._check_new_password(plain_password)
+
+        self.password_hash = await asyncio.to_thread(hash_password, plain_password)
+        logger.debug("Password set for user '%s'", self.username)
+
+    @staticmethod
+    def _check_new_password(plain_password: str) -> None:
+        """
+        Validate a new plain text password.
+
+        Raises:
+            ValueError: If password is invalid
+        """
         if not plain_password or len(plain_password) < 8:
             raise ValueError("Password must be at least 8 characters")
 
         if len(plain_password) > 200:
             raise ValueError("Password too long (max 200 characters)")
 
-        self.password_hash = hash_password(plain_password)
-        logger.debug(f"Password set for user '{self.username}'")
-
     def check_password(self, plain_password: str) -> bool:
         """
         Verify password against stored hash.
@@ -189,6 +825,51 @@ class User:
 
         return verify_password(self.password_hash, plain_password)
 
+    async def check_password_async(self, plain_password: str) -> bool:
+        """
+        Verify password without blocking the event loop.
+
+        Same as check_password(), but Argon2 verification runs on utils' verify pool.
+
+        Args:
+            plain_password (str): Plain text password to verify
+
+        Returns:
+            bool: True if password matches, False otherwise
+
+        Example:
+            >>> await user.check_password_async("SecurePass123!")
+            True
+        """
+        if not self.password_hash or not plain_password:
+            return False
+
+        return await verify_password_async(self.password_hash, plain_password)
+
+    @staticmethod
+    def _cache_result(result: sqlite3.Row) -> tuple:
+        """Convert a users row to a plain tuple and store it in the user cache."""
+        row = (
+            result['id'],
+            result['username'],
+            result['password_hash'],
+            result['email'],
+            _from_epoch(result['created_at'])
+        )
+        _cache_user_row(row)
+        return row
+
+    @staticmethod
+    def _from_row(row: tuple) -> 'User':
+        """Build a fresh User from a cached (id, username, password_hash, email, created_at) row."""
+        return User(
+            id=row[0],
+            username=row[1],
+            password_hash=row[2],
+            email=row[3],
+            created_at=row[4]
+        )
+
     @staticmethod
     def find_by_username(username: str) -> Optional['User']:
         """
@@ -210,46 +891,24 @@ class User:
             >>> if user:
             ...     print(f"Found user: {user.email}")
         """
-        if not username or len(username) > 50:
-            logger.warning(f"Invalid username length for search: {len(username)}")
+        username_length = len(username) if username else 0
+        if not 0 < username_length <= 50:
+            logger.warning("Invalid username length for search: %d", username_length)
             return None
 
-        try:
-            with get_db() as conn:
-                cursor = conn.cursor()
-
-                # SECURITY: Parameterized query prevents SQL injection
-                cursor.execute(
-                    """
-                    SELECT id, username, password_hash, email, created_at
-                    FROM users
-                    WHERE username = ?
-                    """,
-                    (username,)
-                )
-
-                result = cursor.fetchone()
-
-                if result:
-                    logger.debug(f"User '{username}' found")
-                    return User(
-                        id=result['id'],
-                        username=result['username'],
-                        password_hash=result['password_hash'],
-                        email=result['email'],
-                        created_at=datetime.fromisoformat(result['created_at'])
-                    )
-
-                logger.debug(f"User '{username}' not found")
-                return None
+        cached = _cached_user_row(('username', username))
+        if cached:
+            return User._from_row(cached)
 
-        except sqlite3.Error as e:
-            logger.error(f"Database error finding user '{username}': {str(e)}")
+        # SECURITY: Parameterized query prevents SQL injection
+        result = _db_call("find user", username, _fetch_one,
+                          _SQL_FIND_USER_BY_USERNAME, (username,))
+        if result is _DB_FAILED or result is None:
+            logger.debug("User '%s' not found", username)
             return None
 
-        except Exception as e:
-            logger.error(f"Unexpected error finding user '{username}': {str(e)}")
-            return None
+        logger.debug("User '%s' found", username)
+        return User._from_row(User._cache_result(result))
 
     @staticmethod
     def find_by_id(user_id: int) -> Optional['User']:
@@ -265,40 +924,20 @@ class User:
         Example:
             >>> user = User.find_by_id(123)
         """
-        if not isinstance(user_id, int) or user_id <= 0:
-            logger.warning(f"Invalid user_id for search: {user_id}")
+        if type(user_id) is not int or user_id <= 0:
+            logger.warning("Invalid user_id for search: %r", user_id)
             return None
 
-        try:
-            with get_db() as conn:
-                cursor = conn.cursor()
+        cached = _cached_user_row(('id', user_id))
+        if cached:
+            return User._from_row(cached)
 
-                cursor.execute(
-                    """
-                    SELECT id, username, password_hash, email, created_at
-                    FROM users
-                    WHERE id = ?
-                    """,
-                    (user_id,)
-                )
-
-                result = cursor.fetchone()
-
-                if result:
-                    return User(
-                        id=result['id'],
-                        username=result['username'],
-                        password_hash=result['password_hash'],
-                        email=result['email'],
-                        created_at=datetime.fromisoformat(result['created_at'])
-                    )
-
-                return None
-
-        except sqlite3.Error as e:
-            logger.error(f"Database error finding user {user_id}: {str(e)}")
+        result = _db_call("find user", user_id, _fetch_one, _SQL_FIND_USER_BY_ID, (user_id,))
+        if result is _DB_FAILED or result is None:
             return None
 
+        return User._from_row(User._cache_result(result))
+
     def update_password(self, new_password: str) -> bool:
         """
         Update user password with secure hashing.
@@ -325,42 +964,37 @@ class User:
         try:
             # Hash the new password
             self.set_password(new_password)
+        except ValueError as e:
+            logger.warning("Password validation failed for user %s: %s", self.id, e)
+            return False
 
+        def _update() -> None:
             with get_db() as conn:
-                cursor = conn.cursor()
-
                 # SECURITY: Parameterized query prevents SQL injection
-                cursor.execute(
+                conn.execute(
                     "UPDATE users SET password_hash = ? WHERE id = ?",
                     (self.password_hash, self.id)
                 )
-
                 conn.commit()
 
-                logger.info(f"Password updated for user {self.id}")
-                return True
-
-        except ValueError as e:
-            logger.warning(f"Password validation failed for user {self.id}: {str(e)}")
+        if _db_call("update password", self.id, _update) is _DB_FAILED:
             return False
 
-        except sqlite3.Error as e:
-            logger.error(f"Database error updating password for user {self.id}: {str(e)}")
-            return False
-
-        except Exception as e:
-            logger.error(f"Unexpected error updating password for user {self.id}: {str(e)}")
-            return False
+        _invalidate_user(self.id, self.username)
+        logger.info("Password updated for user %s", self.id)
+        return True
 
 
+@dataclass(slots=True, eq=False)
 class Session:
     """
     User session with secure token generation and expiration.
 
     SECURITY IMPROVEMENTS from vulnerable version:
-    - Cryptographically secure token generation (uses secrets module)
+    - Cryptographically secure token generation (os.urandom)
     - Session expiration
     - Parameterized queries prevent SQL injection
+    - Only a BLAKE2b digest of the token is stored and queried
 
     Attributes:
         id (int): Session ID
@@ -370,29 +1004,17 @@ class Session:
         expires_at (datetime): Session expiration time
     """
 
-    def __init__(
-        self,
-        id: Optional[int] = None,
-        user_id: int = 0,
-        token: str = "",
-        created_at: Optional[datetime] = None,
-        expires_at: Optional[datetime] = None
-    ):
-        """
-        Initialize Session instance.
+    id: Optional[int] = None
+    user_id: int = 0
+    token: str = field(default="", repr=False)
+    created_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
 
-        Args:
-            id (int, optional): Session ID
-            user_id (int): User ID
-            token (str): Session token
-            created_at (datetime, optional): Creation timestamp
-            expires_at (datetime, optional): Expiration timestamp
-        """
-        self.id = id
-        self.user_id = user_id
-        self.token = token
-        self.created_at = created_at or datetime.now()
-        self.expires_at = expires_at or (datetime.now() + timedelta(hours=24))
+    def __post_init__(self) -> None:
+        if self.created_at is None:
+            self.created_at = datetime.now()
+        if self.expires_at is None:
+            self.expires_at = datetime.now() + timedelta(hours=24)
 
     @staticmethod
     def create(user_id: int, expiration_hours: int = 24) -> Optional['Session']:
@@ -400,7 +1022,7 @@ class Session:
         Create new session with cryptographically secure token.
 
         SECURITY IMPROVEMENTS:
-        - Uses secrets module for cryptographically secure tokens
+        - Uses os.urandom for cryptographically secure tokens
         - Includes expiration timestamp
         - Parameterized query prevents SQL injection
 
@@ -415,49 +1037,109 @@ class Session:
             >>> session = Session.create(user_id=123, expiration_hours=12)
             >>> print(session.token)
         """
-        if not isinstance(user_id, int) or user_id <= 0:
-            logger.warning(f"Invalid user_id for session creation: {user_id}")
+        if type(user_id) is not int or user_id <= 0:
+            logger.warning("Invalid user_id for session creation: %r", user_id)
             return None
 
-        try:
-            # SECURITY: Generate cryptographically secure token
-            token = generate_token(32)
+        # SECURITY: Generate cryptographically secure token
+        token = _new_session_token()
+
+        created_at = datetime.now()
+        expires_at = created_at + timedelta(hours=expiration_hours)
+
+        def _insert() -> int:
+            with get_db() as conn:
+                # SECURITY: Parameterized query prevents SQL injection
+                cursor = conn.execute(
+                    """
+                    INSERT INTO sessions (user_id, token_hash, created_at, expires_at)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    (user_id, _hash_token(token), _to_epoch(created_at), _to_epoch(expires_at))
+                )
+                conn.commit()
+                return cursor.lastrowid
+
+        session_id = _db_call("create session", f"user {user_id}", _insert)
+        if session_id is _DB_FAILED:
+            return None
 
-            created_at = datetime.now()
-            expires_at = created_at + timedelta(hours=expiration_hours)
+        logger.info("Session created for user %s (expires in %sh)", user_id, expiration_hours)
+
+        return Session(
+            id=session_id,
+            user_id=user_id,
+            token=token,
+            created_at=created_at,
+            expires_at=expires_at
+        )
+
+    @staticmethod
+    def bulk_create(user_ids: List[int], expiration_hours: int = 24) -> List['Session']:
+        """
+        Create sessions for many users in a single transaction.
+
+        Args:
+            user_ids (List[int]): User IDs to create sessions for
+            expiration_hours (int): Hours until sessions expire (default: 24)
+
+        Returns:
+            List[Session]: Created sessions in input order (empty list on failure)
 
+        Raises:
+            ValueError: If any user_id is invalid
+
+        Example:
+            >>> sessions = Session.bulk_create([1, 2, 3], expiration_hours=1)
+        """
+        if not user_ids:
+            return []
+
+        for user_id in user_ids:
+            if type(user_id) is not int or user_id <= 0:
+                raise ValueError(f"Invalid user_id for session creation: {user_id}")
+
+        created_at = datetime.now()
+        expires_at = created_at + timedelta(hours=expiration_hours)
+
+        # SECURITY: Generate cryptographically secure tokens
+        sessions = [
+            Session(user_id=user_id, token=_new_session_token(),
+                    created_at=created_at, expires_at=expires_at)
+            for user_id in user_ids
+        ]
+
+        def _insert() -> int:
             with get_db() as conn:
                 cursor = conn.cursor()
+                cursor.execute("BEGIN")
 
                 # SECURITY: Parameterized query prevents SQL injection
-                cursor.execute(
+                cursor.executemany(
                     """
-                    INSERT INTO sessions (user_id, token, created_at, expires_at)
+                    INSERT INTO sessions (user_id, token_hash, created_at, expires_at)
                     VALUES (?, ?, ?, ?)
                     """,
-                    (user_id, token, created_at, expires_at)
+                    [(s.user_id, _hash_token(s.token),
+                      _to_epoch(s.created_at), _to_epoch(s.expires_at))
+                     for s in sessions]
                 )
 
+                # Rowids are assigned sequentially while we hold the write lock
+                last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
                 conn.commit()
-                session_id = cursor.lastrowid
+                return last_id
 
-                logger.info(f"Session created for user {user_id} (expires in {expiration_hours}h)")
-
-                return Session(
-                    id=session_id,
-                    user_id=user_id,
-                    token=token,
-                    created_at=created_at,
-                    expires_at=expires_at
-                )
+        last_id = _db_call("bulk create sessions", f"{len(sessions)} sessions", _insert)
+        if last_id is _DB_FAILED:
+            return []
 
-        except sqlite3.Error as e:
-            logger.error(f"Database error creating session for user {user_id}: {str(e)}")
-            return None
+        first_id = last_id - len(sessions) + 1
+        for offset, session in enumerate(sessions):
+            session.id = first_id + offset
 
-        except Exception as e:
-            logger.error(f"Unexpected error creating session for user {user_id}: {str(e)}")
-            return None
+        logger.info("Bulk created %d sessions (expire in %sh)", len(sessions), expiration_hours)
+        return sessions
 
     @staticmethod
     def find_by_token(token: str) -> Optional['Session']:
@@ -480,37 +1162,27 @@ class Session:
         if not token:
             return None
 
-        try:
-            with get_db() as conn:
-                cursor = conn.cursor()
+        token_hash = _hash_token(token)
+        cached = _cached_session(token, token_hash)
+        if cached:
+            return cached
 
-                # SECURITY: Parameterized query, check expiration
-                cursor.execute(
-                    """
-                    SELECT id, user_id, token, created_at, expires_at
-                    FROM sessions
-                    WHERE token = ? AND expires_at > ?
-                    """,
-                    (token, datetime.now())
-                )
-
-                result = cursor.fetchone()
-
-                if result:
-                    return Session(
-                        id=result['id'],
-                        user_id=result['user_id'],
-                        token=result['token'],
-                        created_at=datetime.fromisoformat(result['created_at']),
-                        expires_at=datetime.fromisoformat(result['expires_at'])
-                    )
-
-                return None
-
-        except sqlite3.Error as e:
-            logger.error(f"Database error finding session: {str(e)}")
+        # SECURITY: Parameterized query, check expiration
+        result = _db_call("find session", "by token", _fetch_one,
+                          _SQL_FIND_SESSION_BY_TOKEN, (token_hash,))
+        if result is _DB_FAILED or result is None:
             return None
 
+        session = Session(
+            id=result['id'],
+            user_id=result['user_id'],
+            token=token,
+            created_at=_from_epoch(result['created_at']),
+            expires_at=_from_epoch(result['expires_at'])
+        )
+        _cache_session(token_hash, session)
+        return session
+
     def is_valid(self) -> bool:
         """
         Check if session is still valid (not expired).
@@ -537,16 +1209,131 @@ class Session:
         if not self.id:
             return False
 
-        try:
+        _invalidate_session(_hash_token(self.token))
+
+        def _delete() -> None:
+            with get_db() as conn:
+                conn.execute("DELETE FROM sessions WHERE id = ?", (self.id,))
+                conn.commit()
+
+        if _db_call("revoke session", self.id, _delete) is _DB_FAILED:
+            return False
+
+        logger.info("Session %s revoked for user %s", self.id, self.user_id)
+        return True
+
+    @staticmethod
+    def revoke_many(session_ids: List[int]) -> int:
+        """
+        Revoke many sessions in a single transaction.
+
+        Used for bulk logout and cleanup sweeps: one commit instead of one per
+        session. IDs are deleted in batches of at most 500 to stay under
+        SQLite's bound-parameter limit.
+
+        Args:
+            session_ids (List[int]): Session IDs to revoke
+
+        Returns:
+            int: Number of sessions deleted (0 on failure)
+
+        Example:
+            >>> Session.revoke_many([1, 2, 3])
+            3
+        """
+        ids = [session_id for session_id in session_ids
+               if type(session_id) is int and session_id > 0]
+        if not ids:
+            return 0
+
+        def _delete() -> List[str]:
             with get_db() as conn:
                 cursor = conn.cursor()
+                cursor.execute("BEGIN")
+
+                revoked = []
+                for start in range(0, len(ids), _REVOKE_BATCH_SIZE):
+                    batch = ids[start:start + _REVOKE_BATCH_SIZE]
+                    placeholders = ", ".join("?" * len(batch))
+                    cursor.execute(
+                        f"DELETE FROM sessions WHERE id IN ({placeholders}) RETURNING token_hash",
+                        batch
+                    )
+                    revoked.extend(row[0] for row in cursor.fetchall())
 
-                cursor.execute("DELETE FROM sessions WHERE id = ?", (self.id,))
                 conn.commit()
+                return revoked
 
-                logger.info(f"Session {self.id} revoked for user {self.user_id}")
-                return True
+        revoked = _db_call("revoke sessions", f"{len(ids)} sessions", _delete)
+        if revoked is _DB_FAILED:
+            return 0
 
-        except sqlite3.Error as e:
-            logger.error(f"Database error revoking session {self.id}: {str(e)}")
-            return False
+        for token_hash in revoked:
+            _invalidate_session(token_hash)
+
+        logger.info("Revoked %d sessions", len(revoked))
+        return len(revoked)
+
+    @staticmethod
+    def purge_expired() -> int:
+        """
+        Delete all expired sessions.
+
+        Returns:
+            int: Number of sessions deleted (0 on failure)
+
+        Example:
+            >>> Session.purge_expired()
+            42
+        """
+        def _delete() -> List[str]:
+            with get_db() as conn:
+                cursor = conn.execute(
+                    "DELETE FROM sessions WHERE expires_at <= unixepoch() RETURNING token_hash"
+                )
+                purged = [row[0] for row in cursor.fetchall()]
+                conn.commit()
+                return purged
+
+        purged = _db_call("purge sessions", "expired", _delete)
+        if purged is _DB_FAILED:
+            return 0
+
+        for token_hash in purged:
+            _invalidate_session(token_hash)
+
+        if purged:
+            logger.info("Purged %d expired sessions", len(purged))
+        return len(purged)
+
+
+_PURGE_STOP = threading.Event()
+_PURGE_THREAD: Optional[threading.Thread] = None
+
+
+def start_session_purger(interval_seconds: float = 3600) -> None:
+    """
+    Run Session.purge_expired() periodically on a daemon thread.
+
+    Args:
+        interval_seconds (float): Seconds between sweeps (default: 3600)
+
+    Example:
+        >>> start_session_purger(interval_seconds=600)
+    """
+    global _PURGE_THREAD
+    if _PURGE_THREAD is not None and _PURGE_THREAD.is_alive():
+        return
+
+    def _run() -> None:
+        while not _PURGE_STOP.wait(interval_seconds):
+            Session.purge_expired()
+
+    _PURGE_STOP.clear()
+    _PURGE_THREAD = threading.Thread(target=_run, name="session-purger", daemon=True)
+    _PURGE_THREAD.start()
+
+
+def stop_session_purger() -> None:
+    """Stop the background session purger started by start_session_purger()."""
+    _PURGE_STOP.set()
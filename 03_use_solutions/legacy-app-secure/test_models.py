@@ -0,0 +1,108 @@
+"""
+Tests for the secure database models.
+
+Each test runs against a fresh SQLite file in a temporary directory.
+"""
+
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+import models
+
+
+@pytest.fixture(autouse=True)
+def fresh_db(tmp_path, monkeypatch):
+    """Point the models at an empty database and reset in-process caches."""
+    models.close_pool()
+    monkeypatch.setattr(models, "DB_PATH", str(tmp_path / "users.db"))
+    models._USER_CACHE.clear()
+    models._SESSION_CACHE.clear()
+    yield
+    models.close_pool()
+
+
+def _create_user(username: str) -> models.User:
+    user = models.User(username=username, email=f"{username}@example.com")
+    user.set_password("SecurePass123!")
+    assert user.save()
+    return user
+
+
+def test_deleting_user_revokes_their_sessions():
+    """Sessions reference users ON DELETE CASCADE, so a deleted user's token stops working."""
+    user = _create_user("alice")
+    session = models.Session.create(user.id)
+    assert session is not None
+
+    with models.get_db() as conn:
+        conn.execute("DELETE FROM users WHERE id = ?", (user.id,))
+        conn.commit()
+
+        remaining = conn.execute(
+            "SELECT COUNT(*) FROM sessions WHERE user_id = ?", (user.id,)
+        ).fetchone()[0]
+
+    assert remaining == 0
+    assert models.Session.find_by_token(session.token) is None
+
+
+def test_timestamps_round_trip_as_epoch_seconds():
+    """Timestamps are written as INTEGER epoch seconds and read back as datetimes."""
+    user = _create_user("bob")
+    session = models.Session.create(user.id)
+
+    with models.get_db() as conn:
+        types = conn.execute(
+            "SELECT typeof(created_at), typeof(expires_at) FROM sessions WHERE id = ?",
+            (session.id,)
+        ).fetchone()
+    assert tuple(types) == ("integer", "integer")
+
+    models._SESSION_CACHE.clear()
+    found = models.Session.find_by_token(session.token)
+    assert found.expires_at == session.expires_at.replace(microsecond=0)
+
+    models._USER_CACHE.clear()
+    assert models.User.find_by_id(user.id).created_at == user.created_at.replace(microsecond=0)
+
+
+def test_migrates_legacy_database_with_orphan_session():
+    """A pre-migration database (text timestamps, raw tokens, orphan rows) upgrades cleanly."""
+    conn = sqlite3.connect(models.DB_PATH)
+    conn.executescript(
+        """
+        CREATE TABLE users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL UNIQUE,
+            password_hash TEXT NOT NULL,
+            email TEXT NOT NULL UNIQUE,
+            created_at TEXT NOT NULL
+        );
+        CREATE TABLE sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            token TEXT NOT NULL UNIQUE,
+            created_at TEXT NOT NULL,
+            expires_at TEXT NOT NULL
+        );
+        INSERT INTO users VALUES (1, 'carol', 'hash', 'carol@example.com', '2024-01-02 03:04:05');
+        INSERT INTO sessions VALUES
+            (1, 1, 'live-token', '2024-01-02 03:04:05', '2999-01-01 00:00:00');
+        -- Left behind by a user deleted before sessions cascaded
+        INSERT INTO sessions VALUES
+            (2, 99, 'orphan-token', '2024-01-02 03:04:05', '2999-01-01 00:00:00');
+        """
+    )
+    conn.close()
+
+    assert models.User.find_by_username("carol").created_at == datetime(2024, 1, 2, 3, 4, 5)
+    assert models.Session.find_by_token("live-token").user_id == 1
+    assert models.Session.find_by_token("orphan-token") is None
+
+    with models.get_db() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == models._SCHEMA_VERSION
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        assert conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] == 1
+        assert not conn.in_transaction
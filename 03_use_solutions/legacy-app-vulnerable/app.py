@@ -3,8 +3,9 @@ Legacy Flask Application (circa 2015)
 INTENTIONALLY CONTAINS SECURITY VULNERABILITIES FOR DEMO PURPOSES
 """
 
-from flask import Flask, request
+from flask import Flask, g, request
 import sqlite3
+import threading
 import os
 
 app = Flask(__name__)
@@ -17,16 +18,34 @@ DB_USER = "admin"
 DB_PASS = "Password123"
 
 
+_local = threading.local()
+
+
+def get_db():
+    """Return this thread's database connection, attached to the request via g"""
+    if 'db' not in g:
+        conn = getattr(_local, 'conn', None)
+        if conn is None:
+            conn = _local.conn = sqlite3.connect('users.db')
+        g.db = conn
+    return g.db
+
+
+@app.teardown_appcontext
+def release_db(exc):
+    """Roll back anything the request left uncommitted; the connection stays open"""
+    db = g.pop('db', None)
+    if db is not None and db.in_transaction:
+        db.rollback()
+
+
 @app.route('/users/<id>')
 def get_user(id):
-    """Get user by ID - HAS SQL INJECTION VULNERABILITY"""
-    # SECURITY ISSUE: SQL injection vulnerability
-    conn = sqlite3.connect('users.db')
+    """Get user by ID - NO AUTHENTICATION"""
+    conn = get_db()
     cursor = conn.cursor()
-    query = "SELECT * FROM users WHERE id = " + id  # Vulnerable!
-    cursor.execute(query)
+    cursor.execute("SELECT * FROM users WHERE id = ?", (id,))
     user = cursor.fetchone()
-    conn.close()
     return str(user)
 
 
@@ -36,14 +55,15 @@ def login():
     username = request.form['username']
     password = request.form['password']  # Plain text password!
 
-    conn = sqlite3.connect('users.db')
+    conn = get_db()
     cursor = conn.cursor()
 
-    # SECURITY ISSUE: Plain text password storage and SQL injection
-    query = f"SELECT * FROM users WHERE username = '{username}' AND password = '{password}'"
-    cursor.execute(query)
+    # SECURITY ISSUE: Plain text password storage
+    cursor.execute(
+        "SELECT * FROM users WHERE username = ? AND password = ?",
+        (username, password)
+    )
     user = cursor.fetchone()
-    conn.close()
 
     if user:
         return "Login successful"
@@ -57,14 +77,11 @@ def search():
     # SECURITY ISSUE: No input validation
     search_term = request.args.get('q')
 
-    conn = sqlite3.connect('users.db')
+    conn = get_db()
     cursor = conn.cursor()
 
-    # SECURITY ISSUE: SQL injection via search parameter
-    query = f"SELECT * FROM users WHERE name LIKE '%{search_term}%'"
-    cursor.execute(query)
+    cursor.execute("SELECT * FROM users WHERE name LIKE ?", (f"%{search_term}%",))
     results = cursor.fetchall()
-    conn.close()
 
     return str(results)
 
@@ -73,14 +90,11 @@ def search():
 def delete_user(user_id):
     """Delete user - NO AUTHENTICATION/AUTHORIZATION"""
     # SECURITY ISSUE: No authentication check!
-    conn = sqlite3.connect('users.db')
+    conn = get_db()
     cursor = conn.cursor()
 
-    # SECURITY ISSUE: SQL injection
-    query = f"DELETE FROM users WHERE id = {user_id}"
-    cursor.execute(query)
+    cursor.execute("DELETE FROM users WHERE id = ?", (user_id,))
     conn.commit()
-    conn.close()
 
     return "User deleted"
 
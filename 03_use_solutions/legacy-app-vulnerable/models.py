@@ -3,7 +3,13 @@ Legacy database models
 CONTAINS POOR PRACTICES FOR DEMO PURPOSES
 """
 
+import secrets
 import sqlite3
+import threading
+
+# One shared connection in autocommit mode, serialized by _LOCK
+_CONN = sqlite3.connect('users.db', check_same_thread=False, isolation_level=None)
+_LOCK = threading.Lock()
 
 
 class User:
@@ -16,31 +22,20 @@ class User:
         self.email = email
 
     def save(self):
-        """Save user to database - SQL INJECTION RISK"""
-        conn = sqlite3.connect('users.db')
-        cursor = conn.cursor()
-
-        # SECURITY ISSUE: String concatenation in SQL
-        query = f"""
-            INSERT INTO users (username, password, email)
-            VALUES ('{self.username}', '{self.password}', '{self.email}')
-        """
-
-        cursor.execute(query)
-        conn.commit()
-        conn.close()
+        """Save user to database - PLAIN TEXT STORAGE"""
+        with _LOCK:
+            _CONN.execute(
+                "INSERT INTO users (username, password, email) VALUES (?, ?, ?)",
+                (self.username, self.password, self.email)
+            )
 
     @staticmethod
     def find_by_username(username):
-        """Find user by username - SQL INJECTION RISK"""
-        conn = sqlite3.connect('users.db')
-        cursor = conn.cursor()
-
-        # SECURITY ISSUE: String formatting in SQL query
-        query = f"SELECT * FROM users WHERE username = '{username}'"
-        cursor.execute(query)
-        result = cursor.fetchone()
-        conn.close()
+        """Find user by username"""
+        with _LOCK:
+            result = _CONN.execute(
+                "SELECT * FROM users WHERE username = ?", (username,)
+            ).fetchone()
 
         if result:
             return User(*result)
@@ -48,14 +43,11 @@ class User:
 
     def update_password(self, new_password):
         """Update password - PLAIN TEXT STORAGE"""
-        conn = sqlite3.connect('users.db')
-        cursor = conn.cursor()
-
-        # SECURITY ISSUE: Plain text password, SQL injection
-        query = f"UPDATE users SET password = '{new_password}' WHERE id = {self.id}"
-        cursor.execute(query)
-        conn.commit()
-        conn.close()
+        # SECURITY ISSUE: Plain text password
+        with _LOCK:
+            _CONN.execute(
+                "UPDATE users SET password = ? WHERE id = ?", (new_password, self.id)
+            )
 
         self.password = new_password
 
@@ -65,24 +57,16 @@ class Session:
 
     def __init__(self, user_id, token):
         self.user_id = user_id
-        self.token = token  # ISSUE: No expiration, weak token generation
+        self.token = token  # ISSUE: No expiration
 
     @staticmethod
     def create(user_id):
-        """Create session - WEAK TOKEN GENERATION"""
-        import random
-        import string
-
-        # SECURITY ISSUE: Predictable token generation
-        token = ''.join(random.choices(string.ascii_letters, k=10))
-
-        conn = sqlite3.connect('users.db')
-        cursor = conn.cursor()
+        """Create session - NO EXPIRATION"""
+        token = secrets.token_urlsafe(24)
 
-        # SECURITY ISSUE: SQL injection
-        query = f"INSERT INTO sessions (user_id, token) VALUES ({user_id}, '{token}')"
-        cursor.execute(query)
-        conn.commit()
-        conn.close()
+        with _LOCK:
+            _CONN.execute(
+                "INSERT INTO sessions (user_id, token) VALUES (?, ?)", (user_id, token)
+            )
 
         return Session(user_id, token)